@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.utils.autoreload import autoreload_started
+
+
+def watch_prompts(sender, **kwargs):
+    """Restart the development server when a prompt template changes."""
+    from .views import PROMPT_DIR
+    sender.watch_dir(PROMPT_DIR, '*.txt')
 
 
 class DigitalSkepticAiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'digital_skeptic_ai'
+
+    def ready(self):
+        # Prompts are loaded once at import, so reload the code when they are edited
+        autoreload_started.connect(watch_prompts)
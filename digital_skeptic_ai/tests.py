@@ -1,3 +1,505 @@
-from django.test import TestCase
+import collections
+import json
+import os
+import sys
+import threading
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.test import Client, RequestFactory, SimpleTestCase
+import diskcache
+import httpx
+from tenacity import wait_none
+
+from . import views
+
+
+def feed_in_chunks(parser, text, size):
+    """Feed text to a SectionStreamParser size characters at a time and collect what it yields."""
+    pairs = []
+    for i in range(0, len(text), size):
+        pairs.extend(parser.feed(text[i:i + size]))
+    return pairs
+
+
+class SectionStreamParserTests(SimpleTestCase):
+    def test_yields_each_pair_once_whatever_the_chunk_size(self):
+        reply = json.dumps({
+            "core_claims": "* First claim\n* Second claim",
+            "language_tone": ["neutral", "factual"],
+            "red_flags": "None found.",
+        }, indent=1)
+        for size in (1, 2, 3, 7, len(reply)):
+            with self.subTest(size=size):
+                pairs = feed_in_chunks(views.SectionStreamParser(), reply, size)
+                self.assertEqual(pairs, [
+                    ("core_claims", "* First claim\n* Second claim"),
+                    ("language_tone", ["neutral", "factual"]),
+                    ("red_flags", "None found."),
+                ])
+
+    def test_escaped_quotes_and_unicode_in_values_and_keys(self):
+        reply = json.dumps({'say "hi"': 'He said "no" \\ café “q”'})
+        pairs = feed_in_chunks(views.SectionStreamParser(), reply, 1)
+        self.assertEqual(pairs, [('say "hi"', 'He said "no" \\ café “q”')])
+
+    def test_incomplete_value_is_held_back(self):
+        parser = views.SectionStreamParser()
+        self.assertEqual(list(parser.feed('{"core_claims": "half of it')), [])
+        self.assertEqual(list(parser.feed(' and the rest", "red')), [("core_claims", "half of it and the rest")])
+
+    def test_number_is_held_back_until_its_delimiter(self):
+        parser = views.SectionStreamParser()
+        self.assertEqual(list(parser.feed('{"a": 12')), [])
+        self.assertEqual(list(parser.feed('3')), [])
+        self.assertEqual(list(parser.feed(', "b": true}')), [("a", 123), ("b", True)])
+
+
+class ParseAnalysisTests(SimpleTestCase):
+    def test_missing_sections_are_empty_and_lists_become_bullets(self):
+        results = views.parse_analysis('{"core_claims": ["one", "two"]}', {"core_claims": "", "red_flags": ""})
+        self.assertEqual(results, {"core_claims": "* one\n* two", "red_flags": ""})
+
+
+class ReportRenderingTests(SimpleTestCase):
+    def test_markup_in_sections_and_url_is_shown_as_text(self):
+        results = {key: "* The headline uses <i>loaded terms & more" for key in views.SECTION_TITLES}
+        pdf_bytes = views.render_report_pdf('https://x.com/a?q=<script>', results)
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+
+    def test_markup_in_streamed_section_does_not_abort_the_report(self):
+        async def stream(prompts, article_text, on_section):
+            for key in prompts:
+                on_section(key, "The headline uses <i>loaded terms")
+
+        with mock.patch.object(views, 'stream_openai_analysis', stream):
+            pdf_bytes, analysis_failed = async_to_sync(views.generate_report)(
+                'https://example.com/news/a', views.PROMPTS, "Body", {})
+        self.assertFalse(analysis_failed)
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+
+    def test_error_placeholder_with_markup_is_rendered(self):
+        async def stream(prompts, article_text, on_section):
+            raise ValueError("paraparser: syntax error: <i> not closed")
+
+        with mock.patch.object(views, 'stream_openai_analysis', stream):
+            pdf_bytes, analysis_failed = async_to_sync(views.generate_report)(
+                'https://example.com/news/a', views.PROMPTS, "Body", {})
+        self.assertTrue(analysis_failed)
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+
+
+class ExtractArticleTextTests(SimpleTestCase):
+    def test_paragraphs_of_the_article_div(self):
+        html = b'<html><body><div dataid="/news/a"><p> One </p><p>Two</p></div><p>Footer</p></body></html>'
+        self.assertEqual(views.extract_article_text(html, '/news/a'), 'One\nTwo')
+
+    def test_missing_div_returns_none(self):
+        self.assertIsNone(views.extract_article_text(b'<div dataid="/other"><p>x</p></div>', '/news/a'))
+
+    def test_path_with_quotes_does_not_break_the_lookup(self):
+        html = b'<div dataid="/a&quot;b\\c"><p>Quoted</p></div>'
+        self.assertEqual(views.extract_article_text(html, '/a"b\\c'), 'Quoted')
+        self.assertIsNone(views.extract_article_text(html, '/a"]'))
+
+    def test_fast_path_parses_from_the_article_div(self):
+        html = b'<html><head><title>T</title></head><body><nav>x</nav><div dataid="/news/a"><p>Body</p></div></body></html>'
+        with mock.patch.object(views, 'HTMLParser', wraps=views.HTMLParser) as parser:
+            self.assertEqual(views.extract_article_text(html, '/news/a', 'text/html; charset=utf-8'), 'Body')
+        parser.assert_called_once_with('<div dataid="/news/a"><p>Body</p></div></body></html>')
+
+    def test_falls_back_to_a_full_parse(self):
+        # Attribute written with single quotes is missed by the string search
+        html = b"<html><body><div dataid='/news/a'><p>Body</p></div></body></html>"
+        with mock.patch.object(views, 'HTMLParser', wraps=views.HTMLParser) as parser:
+            self.assertEqual(views.extract_article_text(html, '/news/a', 'text/html; charset=utf-8'), 'Body')
+        self.assertEqual(parser.call_count, 1)
+        self.assertEqual(parser.call_args.args[0], html.decode('utf-8'))
+
+    def test_meta_charset_page(self):
+        text = 'Café “quoted” naïve — résumé'
+        html = ('<html><head><meta charset="windows-1252"></head><body>'
+                f'<div dataid="/news/a"><p>{text}</p></div></body></html>').encode('cp1252')
+        self.assertEqual(views.extract_article_text(html, '/news/a'), text)
+
+    def test_latin_1_label_decodes_as_windows_1252(self):
+        html = '<div dataid="/news/a"><p>“Ünïcode”</p></div>'.encode('cp1252')
+        self.assertEqual(views.extract_article_text(html, '/news/a', 'text/html; charset=ISO-8859-1'), '“Ünïcode”')
+
+    def test_header_charset_page(self):
+        text = 'ニュース記事'
+        html = ('<html><head><title>x</title></head><body>'
+                f'<div dataid="/news/a"><p>{text}</p></div></body></html>').encode('shift_jis')
+        self.assertEqual(views.extract_article_text(html, '/news/a', 'text/html; charset=Shift_JIS'), text)
+
+    def test_undeclared_encoding_is_not_sliced(self):
+        html = '<html><body><div dataid="/news/a"><p>Grüße</p></div></body></html>'.encode('utf-8')
+        with mock.patch.object(views, 'HTMLParser', wraps=views.HTMLParser) as parser:
+            self.assertEqual(views.extract_article_text(html, '/news/a'), 'Grüße')
+        parser.assert_called_once_with(html)
+
+
+class CharacterEncoding:
+    """One token per character, so budgets are easy to reason about."""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+@mock.patch.object(views, '_encoding', return_value=CharacterEncoding())
+class FitTokenBudgetTests(SimpleTestCase):
+    def test_text_within_budget_is_unchanged(self, _):
+        self.assertEqual(views.fit_token_budget("short\ntext", budget=100), "short\ntext")
+
+    def test_slightly_over_budget_is_truncated(self, _):
+        self.assertEqual(views.fit_token_budget("a" * 150, budget=100), "a" * 100)
+
+    def test_one_huge_paragraph_still_fills_the_budget(self, _):
+        result = views.fit_token_budget("\n".join(["a", "x" * 10000, "b"]), budget=100)
+        self.assertEqual(len(result), 100)
+        self.assertEqual(result, "a\n" + "x" * 96 + "\nb")
+
+    def test_condensed_paragraphs_are_spread_and_in_order(self, _):
+        paragraphs = [str(i) * 30 for i in range(10)]
+        result = views.fit_token_budget("\n".join(paragraphs), budget=100)
+        self.assertLessEqual(len(result), 100)
+        kept = result.split("\n")
+        self.assertEqual(kept[0], paragraphs[0])
+        self.assertEqual(kept[-1], paragraphs[-1])
+        self.assertEqual(kept, sorted(kept))
+
+
+@mock.patch.object(views, '_tokenizer', None)
+@mock.patch.object(views, '_tokenizer_retry_at', 0.0)
+class EncodingTests(SimpleTestCase):
+    def test_download_failure_falls_back_to_bytes_and_is_retried_later(self):
+        tokenizer = CharacterEncoding()
+        with mock.patch.object(views.tiktoken, 'encoding_for_model', side_effect=ConnectionError) as load:
+            self.assertIsInstance(views._encoding(), views._ByteEncoding)
+            self.assertIsInstance(views._encoding(), views._ByteEncoding)
+            self.assertEqual(load.call_count, 1)
+
+            load.side_effect = None
+            load.return_value = tokenizer
+            with mock.patch('time.time', return_value=time.time() + views.ENCODING_RETRY_INTERVAL):
+                self.assertIs(views._encoding(), tokenizer)
+            self.assertIs(views._encoding(), tokenizer)
+            self.assertEqual(load.call_count, 2)
+
+    def test_other_errors_are_not_hidden(self):
+        with mock.patch.object(views.tiktoken, 'encoding_for_model', side_effect=KeyError(views.MODEL)):
+            with self.assertRaises(KeyError):
+                views._encoding()
+
+    def test_byte_estimate_counts_multibyte_characters(self):
+        encoding = views._ByteEncoding()
+        self.assertEqual(encoding.decode(encoding.encode("abcdefghij")[:2]), "abcdef")
+        self.assertEqual(len(encoding.encode("ニュース記事")), 6)
+
+
+def api_error(error_class, status):
+    """Build an OpenAI API error as the client raises it for an HTTP status."""
+    response = httpx.Response(status, request=httpx.Request('GET', 'https://api.openai.com/v1/batches/x'))
+    return error_class("API error", response=response, body=None)
+
+
+@mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'test'})
+class BatchResultTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(views, 'OpenAI')
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        reports_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(reports_dir.cleanup)
+        patcher = mock.patch.object(views, 'REPORTS_DIR', reports_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.request = RequestFactory().get('/result/batch_1/')
+
+    def batch(self, status, output_file_id=None, error_file_id=None):
+        self.client.batches.retrieve.return_value = SimpleNamespace(
+            id='batch_1', status=status, output_file_id=output_file_id, error_file_id=error_file_id,
+            metadata={'url': 'https://example.com/news/a'})
+
+    def file_line(self, status_code, body, error=None):
+        line = {"custom_id": "analysis", "response": {"status_code": status_code, "body": body}, "error": error}
+        self.client.files.content.return_value = SimpleNamespace(text=json.dumps(line) + "\n")
+
+    def test_running_batch_is_accepted(self):
+        for status in ('validating', 'in_progress', 'finalizing'):
+            with self.subTest(status=status):
+                self.batch(status)
+                response = views.batch_result(self.request, 'batch_1')
+                self.assertEqual(response.status_code, 202)
+                self.assertEqual(json.loads(response.content), {"job_id": "batch_1", "status": status})
+
+    def test_failed_batch(self):
+        for status in ('failed', 'expired', 'cancelling', 'cancelled'):
+            with self.subTest(status=status):
+                self.batch(status)
+                self.assertEqual(views.batch_result(self.request, 'batch_1').status_code, 502)
+
+    def test_completed_with_error_file(self):
+        self.batch('completed', error_file_id='file_err')
+        self.file_line(400, {"error": {"message": "Bad request"}})
+        response = views.batch_result(self.request, 'batch_1')
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(json.loads(response.content)["error"], {"error": {"message": "Bad request"}})
+        self.client.files.content.assert_called_once_with('file_err')
+
+    def test_completed_with_failed_request_in_output(self):
+        self.batch('completed', output_file_id='file_out')
+        self.file_line(500, {"error": {"message": "Server error"}})
+        self.assertEqual(views.batch_result(self.request, 'batch_1').status_code, 502)
+
+    def test_output_download_failure(self):
+        self.batch('completed', output_file_id='file_out')
+        self.client.files.content.side_effect = views.APIConnectionError(
+            request=httpx.Request('GET', 'https://api.openai.com/v1/files/file_out/content'))
+        self.assertEqual(views.batch_result(self.request, 'batch_1').status_code, 502)
+
+    def test_unreadable_reply(self):
+        # Replies cut off at max_tokens are not valid JSON; refused ones have no content
+        for content in ('{"core_claims": "* A fin', None):
+            with self.subTest(content=content):
+                self.batch('completed', output_file_id='file_out')
+                self.file_line(200, {"choices": [{"message": {"content": content}, "finish_reason": "length"}]})
+                self.assertEqual(views.batch_result(self.request, 'batch_1').status_code, 502)
+
+    def test_completed_batch_is_stored_and_redirected(self):
+        self.batch('completed', output_file_id='file_out')
+        content = json.dumps({key: "* A finding" for key in views.PROMPTS})
+        self.file_line(200, {"choices": [{"message": {"content": content}}]})
+        response = views.batch_result(self.request, 'batch_1')
+        self.assertEqual(response.status_code, 303)
+        digest = views.report_digest(views.cache_key('report', 'batch', 'batch_1'))
+        self.assertEqual(response['Location'], views.report_url(digest))
+        with open(views.report_path(digest), 'rb') as f:
+            self.assertTrue(f.read().startswith(b"%PDF"))
+
+        # Later polls neither ask OpenAI again nor re-render
+        self.client.reset_mock()
+        self.assertEqual(views.batch_result(self.request, 'batch_1').status_code, 303)
+        self.client.batches.retrieve.assert_not_called()
+        self.client.files.content.assert_not_called()
+
+    def test_unknown_job_id(self):
+        self.client.batches.retrieve.side_effect = api_error(views.NotFoundError, 404)
+        self.assertEqual(views.batch_result(self.request, 'batch_nope').status_code, 404)
+
+
+@mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'test'})
+@mock.patch.object(views, '_encoding', return_value=CharacterEncoding())
+class SubmitBatchTests(SimpleTestCase):
+    def test_rejected_submission_is_a_client_error(self, _):
+        with mock.patch.object(views, 'fetch_article_text', return_value="Body"), \
+                mock.patch.object(views, 'submit_batch_analysis', side_effect=api_error(views.BadRequestError, 400)):
+            response = async_to_sync(views.analyze_url)('https://example.com/news/a', batch_mode=True)
+        self.assertEqual(response.status_code, 400)
+
+
+class StoredReportTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(views, '_encoding', return_value=CharacterEncoding())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        reports_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(reports_dir.cleanup)
+        patcher = mock.patch.object(views, 'REPORTS_DIR', reports_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.reports_dir = reports_dir.name
+
+    def test_repeat_request_is_redirected_with_see_other(self):
+        url = 'https://example.com/news/a'
+        report_key = views.cache_key('report', url, "Body", '', *views.PROMPTS.values())
+        views.store_report(views.report_digest(report_key), b"%PDF-1.4")
+        with mock.patch.object(views, 'fetch_article_text', return_value="Body"), \
+                mock.patch.object(views, 'ready_local_analyzers', return_value={}), \
+                mock.patch.object(views, 'generate_report') as generate_report:
+            response = async_to_sync(views.analyze_url)(url)
+        generate_report.assert_not_called()
+        self.assertEqual(response.status_code, 303)
+        self.assertEqual(response['Location'], views.report_url(views.report_digest(report_key)))
+        self.assertNotIn('Cache-Control', response)
+
+    def test_rerendered_report_replaces_the_file(self):
+        views.store_report('abc', b"%PDF-1")
+        views.store_report('abc', b"%PDF-2")
+        self.assertEqual(os.listdir(self.reports_dir), ['abc.pdf'])
+
+    def test_expired_reports_are_pruned(self):
+        views.store_report('old', b"%PDF-1")
+        expired = time.time() - views.CACHE_TIMEOUT - 1
+        os.utime(views.report_path('old'), (expired, expired))
+        self.assertFalse(views.stored_report('old'))
+        with mock.patch.object(views, '_last_prune', 0.0):
+            views.store_report('new', b"%PDF-2")
+        self.assertEqual(os.listdir(self.reports_dir), ['new.pdf'])
+
+
+class FetchArticleTextTests(SimpleTestCase):
+    url = 'https://example.com/news/a'
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = diskcache.Cache(cache_dir.name)
+        self.addCleanup(cache.close)
+        self.requests = []
+        self.responses = []
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        for patcher in (
+            mock.patch.object(views, 'cache', cache),
+            mock.patch.object(views, 'http_client', return_value=client),
+            mock.patch.object(views.fetch_page.retry, 'wait', wait_none()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def handle(self, request):
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+    def fetch(self):
+        return async_to_sync(views.fetch_article_text)(self.url)
+
+    def test_not_modified_article_reuses_the_extracted_text(self):
+        page = '<div dataid="/news/a"><p>Café</p></div>'.encode('cp1252')
+        headers = {'ETag': '"v1"', 'Content-Type': 'text/html; charset=windows-1252'}
+        self.responses = [httpx.Response(200, content=page, headers=headers), httpx.Response(304)]
+        self.assertEqual(self.fetch(), 'Café')
+        self.assertEqual(self.fetch(), 'Café')
+        self.assertEqual(self.requests[1].headers['If-None-Match'], '"v1"')
+
+    def test_gateway_errors_are_retried(self):
+        page = b'<div dataid="/news/a"><p>Body</p></div>'
+        self.responses = [httpx.Response(503), httpx.Response(502), httpx.Response(200, content=page)]
+        self.assertEqual(self.fetch(), 'Body')
+        self.assertEqual(len(self.requests), 3)
+
+    def test_gateway_error_after_last_retry_is_returned(self):
+        self.responses = [httpx.Response(504)] * 4
+        self.assertIsNone(self.fetch())
+        self.assertEqual(len(self.requests), 4)
+
+
+class ProcessUrlTests(SimpleTestCase):
+    def test_async_view_accepts_posts_without_a_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        with mock.patch.object(views, 'fetch_article_text', return_value=None) as fetch_article_text:
+            response = client.post('/', {'url': 'https://example.com/news/a'})
+        self.assertEqual(response.status_code, 404)
+        fetch_article_text.assert_awaited_once_with('https://example.com/news/a')
+
+
+class HttpClientTests(SimpleTestCase):
+    def test_one_client_per_event_loop(self):
+        async def clients():
+            first, second = views.http_client(), views.http_client()
+            await views.close_http_client()
+            return first, second
+
+        first, second = async_to_sync(clients)()
+        self.assertIs(first, second)
+        self.assertTrue(first.is_closed)
+
+
+class LocalAnalyzerTests(SimpleTestCase):
+    def test_broken_transformers_install_leaves_tone_to_the_llm(self):
+        # transformers without torch fails when building the pipeline, not on import
+        transformers = SimpleNamespace(pipeline=mock.Mock(side_effect=RuntimeError("no backend")))
+        views._sentiment_classifier.cache_clear()
+        try:
+            with mock.patch.dict(sys.modules, {'transformers': transformers}), \
+                    self.assertLogs(views.logger, 'WARNING'):
+                self.assertIsNone(views._sentiment_classifier())
+        finally:
+            views._sentiment_classifier.cache_clear()
+
+    def test_entities_are_filtered_and_capped(self):
+        def entity(text, label):
+            return SimpleNamespace(text=text, label_=label)
+
+        ents = [entity("Delhi", "GPE")] * 3 + [entity("Monday", "DATE"), entity("Rs 5 crore", "MONEY")]
+        ents += [entity("Penn State", "ORG")] * 2 + [entity(f"Person {i}", "PERSON") for i in range(20)]
+        with mock.patch.object(views, '_spacy_model', return_value=lambda text: SimpleNamespace(ents=ents)):
+            lines = views.local_entity_recognition("text").split("\n")
+        self.assertEqual(len(lines), views.MAX_ENTITIES)
+        self.assertEqual(lines[:2], ["* Delhi (Country, city or state)", "* Penn State (Organization)"])
+        self.assertFalse(any("Monday" in line or "crore" in line for line in lines))
+
+    def test_models_load_in_a_daemon_thread(self):
+        loaded = threading.Event()
+        analyzers = {'entity_recognition': views.local_entity_recognition}
+
+        def load():
+            loaded.wait()
+            return analyzers
+
+        with mock.patch.object(views, '_models_thread', None), \
+                mock.patch.object(views, '_loaded_analyzers', None), \
+                mock.patch.object(views, 'local_analyzers', side_effect=load):
+            self.assertEqual(views.ready_local_analyzers(), {})
+            self.assertTrue(views._models_thread.daemon)
+            loaded.set()
+            views._models_thread.join()
+            self.assertEqual(views.ready_local_analyzers(), analyzers)
+
+    def test_load_failure_is_logged(self):
+        with mock.patch.object(views, '_models_thread', None), \
+                mock.patch.object(views, '_loaded_analyzers', None), \
+                mock.patch.object(views, 'local_analyzers', side_effect=MemoryError), \
+                self.assertLogs(views.logger, 'ERROR'):
+            views.ready_local_analyzers()
+            views._models_thread.join()
+            self.assertEqual(views.ready_local_analyzers(), {})
+
+
+class CacheTests(SimpleTestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = diskcache.Cache(cache_dir.name)
+        self.addCleanup(cache.close)
+        for patcher in (
+            mock.patch.object(views, 'cache', cache),
+            mock.patch.object(views, '_memory_cache', collections.OrderedDict()),
+            mock.patch.object(views, 'cache_stats', collections.Counter()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_memory_tier_expires_with_the_disk_entry(self):
+        views.cache_set('analysis:x', {'core_claims': 'text'})
+        self.assertEqual(views.cache_get('analysis:x'), {'core_claims': 'text'})
+        self.assertEqual(views.cache_get('analysis:x'), {'core_claims': 'text'})
+        self.assertEqual(dict(views.cache_stats), {'disk_hits': 1, 'memory_hits': 1})
+
+        expired = time.time() + views.CACHE_TIMEOUT + 1
+        with mock.patch('time.time', return_value=expired):
+            self.assertIsNone(views.cache.get('analysis:x'))
+            self.assertIsNone(views.cache_get('analysis:x'))
+        self.assertEqual(views.cache_stats['misses'], 1)
+
+    def test_memory_tier_is_bounded(self):
+        with mock.patch.object(views, 'MEMORY_CACHE_SIZE', 2):
+            for key in ('a:1', 'a:2', 'a:3'):
+                views.cache_set(key, key)
+                views.cache_get(key)
+        self.assertEqual(list(views._memory_cache), ['a:2', 'a:3'])
+
+    def test_status_endpoint(self):
+        views.cache_set('analysis:x', 'text')
+        views.cache_get('analysis:x')
+        views.cache_get('analysis:y')
+        response = Client().get('/cache/')
+        self.assertEqual(json.loads(response.content), {
+            "memory_hits": 0, "disk_hits": 1, "misses": 1, "memory_entries": 1, "disk_entries": 1,
+        })
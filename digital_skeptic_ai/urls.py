@@ -8,4 +8,11 @@ urlpatterns = [
     # Handles POST requests with a 'url' parameter to analyze news articles
     # Returns a PDF report with the critical analysis
     path('', views.process_url, name='process_url'),
+    # Batch result URL pattern (/result/<job_id>/)
+    # Polls a batch analysis queued with POST /?mode=batch
+    # Returns the PDF report once the batch has completed, otherwise its status
+    path('result/<str:job_id>/', views.batch_result, name='batch_result'),
+    # Cache status URL pattern (/cache/)
+    # Returns this worker's analysis cache hit and miss counters as JSON
+    path('cache/', views.cache_status, name='cache_status'),
 ]
\ No newline at end of file
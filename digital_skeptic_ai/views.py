@@ -1,22 +1,1098 @@
 
 # Standard Django imports
-from django.http import JsonResponse, HttpResponse
-from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+from django.http import JsonResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 
 # Third-party imports
-import google.generativeai as genai
+import asyncio
+import codecs
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import io
+import itertools
 import json
+import logging
+import re
+import threading
+import time
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-import requests
+import weakref
+from xml.sax.saxutils import escape
+from selectolax.parser import HTMLParser
+import httpx
 from dotenv import load_dotenv
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APIError, APITimeoutError, BadRequestError, InternalServerError, NotFoundError, RateLimitError
+from tenacity import retry, retry_if_exception_type, retry_if_result, stop_after_attempt, wait_exponential, wait_random_exponential
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+import diskcache
+import tiktoken
 import os
 
 # Load environment variables from .env file
 load_dotenv()
 
-@csrf_exempt
-def process_url(request):
+logger = logging.getLogger(__name__)
+
+# OpenAI model used for the analysis
+MODEL = "gpt-4o-mini"
+
+# Article fetch client settings
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
+}
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+# Gateway errors that are retried, like connection failures
+RETRY_STATUSES = {502, 503, 504}
+# Article fetch clients by event loop, see http_client()
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def http_client():
+    """
+    Return the async HTTP client used to fetch articles.
+    
+    The client speaks HTTP/2 where the news site supports it, keeps connections
+    alive, retries failed connection attempts and follows redirects.
+    
+    Note:
+        A client can only be used on the event loop it was created on, so one
+        is kept per loop. Served over ASGI (see project/asgi.py) that is a
+        single client for the life of the process, closed by close_http_client()
+        on shutdown; under WSGI every request runs on a new loop and gets its own.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None:
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=3)
+        client = httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, follow_redirects=True)
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """Close the article fetch client of the running event loop, if it has one."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# Two-tier cache for LLM analyses: a per-process LRU in front of an on-disk
+# cache shared by every worker on the machine, which also keeps article validators
+CACHE_DIR = os.getenv('DIGITAL_SKEPTIC_CACHE_DIR', os.path.expanduser('~/.digital_skeptic/cache'))
+CACHE_TIMEOUT = 7 * 24 * 3600
+cache = diskcache.Cache(CACHE_DIR)
+# Most recently used entries kept in the per-process memory tier
+MEMORY_CACHE_SIZE = 128
+# Memory tier: key -> (value, expire time copied from the disk entry)
+_memory_cache = collections.OrderedDict()
+_memory_lock = threading.Lock()
+# Lookups per tier, see cache_status()
+cache_stats = collections.Counter()
+
+
+def cache_get(key):
+    """
+    Return the cached value for key, or None if it is not cached.
+    
+    Args:
+        key (str): Cache key, see cache_key()
+        
+    Returns:
+        The cached value, or None on a miss. Hits and misses are counted in cache_stats.
+        
+    Note:
+        Values read from disk are kept in memory until the disk entry would
+        have expired, so both tiers honor CACHE_TIMEOUT
+    """
+    with _memory_lock:
+        entry = _memory_cache.get(key)
+        if entry is not None:
+            if entry[1] > time.time():
+                _memory_cache.move_to_end(key)
+                cache_stats['memory_hits'] += 1
+                return entry[0]
+            del _memory_cache[key]
+
+    value, expire_time = cache.get(key, expire_time=True)
+    if value is None:
+        cache_stats['misses'] += 1
+        return None
+    with _memory_lock:
+        _memory_cache[key] = (value, expire_time or float('inf'))
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+        cache_stats['disk_hits'] += 1
+    return value
+
+
+def cache_set(key, value):
+    """Store value on disk for CACHE_TIMEOUT seconds; the memory tier fills on next read."""
+    cache.set(key, value, expire=CACHE_TIMEOUT)
+
+
+def cache_key(kind, *parts):
+    """Build a cache key for kind ('analysis', 'pdf', ...) from a sha256 of parts."""
+    digest = hashlib.sha256("\x00".join(parts).encode('utf-8')).hexdigest()
+    return f"{kind}:{digest}"
+
+
+# Folder holding the analysis prompt templates
+PROMPT_DIR = os.path.join(os.path.dirname(__file__), '..', 'prompts')
+PROMPT_FILES = (
+    'core_claims.txt',
+    'language_tone.txt',
+    'red_flags.txt',
+    'verification_questions.txt',
+    'entity_recognition.txt',
+    'counter_argument.txt',
+)
+
+
+def load_prompts():
+    """
+    Load the analysis prompt templates from the prompts folder.
+    
+    Returns:
+        dict: Mapping of section key (prompt file name without extension) to prompt text
+    """
+    prompts = {}
+    for fname in PROMPT_FILES:
+        with open(os.path.join(PROMPT_DIR, fname), encoding='utf-8') as f:
+            prompts[os.path.splitext(fname)[0]] = f.read().strip()
+    return prompts
+
+
+# Prompt templates are static, so they are read once at import time
+PROMPTS = load_prompts()
+
+
+def get_api_key():
+    """Read the OpenAI API key from environment variables."""
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OpenAI API key not found in environment variables")
+    return api_key
+
+
+# charset parameter of a Content-Type header or <meta> tag
+_CHARSET = re.compile(rb'charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_BOMS = ((b'\xef\xbb\xbf', 'utf-8'), (b'\xff\xfe', 'utf-16-le'), (b'\xfe\xff', 'utf-16-be'))
+# Browsers decode pages labelled latin-1 or ascii as windows-1252
+_WINDOWS_1252_ALIASES = {'iso8859-1', 'ascii'}
+
+
+def page_encoding(html, content_type=None):
+    """
+    Determine the character encoding of an HTML page.
+    
+    Args:
+        html (bytes): Raw HTML of the page
+        content_type (str): Content-Type response header, if any
+        
+    Returns:
+        str: Python codec name, or None if the page does not declare a known encoding
+        
+    Note:
+        A byte order mark wins, then the Content-Type charset, then a <meta>
+        charset within the first 1024 bytes, as in the HTML encoding sniffing rules.
+    """
+    for bom, name in _BOMS:
+        if html.startswith(bom):
+            return name
+    candidates = []
+    if content_type:
+        candidates.append(_CHARSET.search(content_type.encode('latin-1', 'replace')))
+    candidates.append(_CHARSET.search(html[:1024]))
+    for match in candidates:
+        if match is None:
+            continue
+        try:
+            name = codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            continue
+        return 'cp1252' if name in _WINDOWS_1252_ALIASES else name
+    return None
+
+
+def find_article_div(tree, data_id):
+    """
+    Find the main article div in a parsed page.
+    
+    Args:
+        tree (HTMLParser): Parsed article page
+        data_id (str): dataid attribute of the main article div
+        
+    Returns:
+        Node: The first div whose dataid equals data_id, or None
+        
+    Note:
+        The attribute is compared in Python rather than interpolated into a CSS
+        selector, so paths containing quotes or backslashes cannot break the query.
+    """
+    for node in tree.css('div[dataid]'):
+        if node.attributes.get('dataid') == data_id:
+            return node
+    return None
+
+
+def extract_article_text(html, data_id, content_type=None):
+    """
+    Extract the article text from a news article page.
+    
+    Args:
+        html (bytes): Raw HTML of the article page
+        data_id (str): dataid attribute of the main article div
+        content_type (str): Content-Type response header, used to decode the page
+        
+    Returns:
+        str: Paragraph texts of the article joined by newlines, or None if the
+             main article div is missing
+             
+    Note:
+        Fast path: when the page encoding is known (see page_encoding()), the
+        page is decoded once, the div's dataid attribute is located with a plain
+        string search and only the document from that tag onward is parsed,
+        skipping the <head>, inline scripts and navigation before it. Pages
+        where the attribute is written differently fall back to a full parse,
+        and so do pages without a declared encoding, whose <meta> charset must
+        stay in front of the parser.
+    """
+    main_div = None
+
+    encoding = page_encoding(html, content_type)
+    if encoding is not None:
+        html = html.decode(encoding, errors='replace')
+        marker_pos = html.find(f'dataid="{data_id}"')
+        if marker_pos != -1:
+            tag_start = html.rfind('<', 0, marker_pos)
+            if tag_start != -1:
+                main_div = find_article_div(HTMLParser(html[tag_start:]), data_id)
+
+    if main_div is None:
+        # Parse with the C-based selectolax parser, which detects the encoding of raw bytes itself
+        main_div = find_article_div(HTMLParser(html), data_id)
+    if main_div is None:
+        return None
+
+    # Extract all paragraph texts inside the main div
+    return "\n".join(p.text(strip=True) for p in main_div.css("p"))
+
+
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=0.3),
+    retry=retry_if_result(lambda response: response.status_code in RETRY_STATUSES),
+    # Out of retries: hand the last error response back to the caller
+    retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+)
+async def fetch_page(url, headers):
+    """Send a GET for url with the shared client, retrying gateway errors with backoff."""
+    return await http_client().get(url, headers=headers)
+
+
+async def fetch_article_text(url):
+    """
+    Scrape the article text from a news article URL.
+    
+    Args:
+        url (str): URL of the news article
+        
+    Returns:
+        str: Paragraph texts of the article joined by newlines, or None if the
+             main article div (identified by the URL path as its dataid) is missing
+             
+    Raises:
+        httpx.HTTPError: If the article cannot be fetched
+        
+    Note:
+        Articles are revalidated with a conditional GET (ETag / Last-Modified).
+        When the server answers 304 Not Modified, the previously extracted text
+        is reused without downloading or parsing the page again.
+    """
+    # Extract unique dataid from URL path
+    parsed_url = urlparse(url)
+    data_id = parsed_url.path
+
+    # Send the validators of the last fetch, if the server provided any
+    article_key = cache_key('article', url)
+    cached = cache.get(article_key)
+    headers = {}
+    if cached is not None:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    # Fetch HTML content from the article URL
+    response = await fetch_page(url, headers)
+    if response.status_code == 304 and cached is not None:
+        return cached['text']
+
+    article_text = extract_article_text(response.content, data_id, response.headers.get('Content-Type'))
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if article_text is not None and (etag or last_modified):
+        cache.set(article_key, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'text': article_text,
+        }, expire=CACHE_TIMEOUT)
+    return article_text
+
+
+# Maximum number of article tokens sent to the model
+ARTICLE_TOKEN_BUDGET = 3500
+
+
+class _ByteEncoding:
+    """
+    Stand-in for a tiktoken encoding counting three UTF-8 bytes per token.
+    
+    Counting bytes rather than characters keeps the estimate within the budget
+    for non-Latin scripts, whose characters take several bytes and often a
+    token each; English text comes out somewhat shorter than with tiktoken.
+    """
+
+    BYTES_PER_TOKEN = 3
+
+    def encode(self, text):
+        tokens, token, size = [], [], 0
+        for char in text:
+            token.append(char)
+            size += len(char.encode('utf-8'))
+            if size >= self.BYTES_PER_TOKEN:
+                tokens.append("".join(token))
+                token, size = [], 0
+        if token:
+            tokens.append("".join(token))
+        return tokens
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+# Seconds before retrying a tokenizer download that failed
+ENCODING_RETRY_INTERVAL = 300
+_tokenizer = None
+_tokenizer_retry_at = 0.0
+
+
+def _encoding():
+    """
+    Return the tokenizer of MODEL, loaded on first use.
+    
+    Note:
+        tiktoken downloads the encoding file the first time it is used, unless
+        it is already in TIKTOKEN_CACHE_DIR. When the download or the cache
+        file cannot be read (e.g. no network access) the budget falls back to
+        a byte estimate instead of failing every request, and the download is
+        tried again after ENCODING_RETRY_INTERVAL seconds.
+    """
+    global _tokenizer, _tokenizer_retry_at
+    if _tokenizer is None and time.time() >= _tokenizer_retry_at:
+        try:
+            # requests errors raised by the download are OSErrors too
+            _tokenizer = tiktoken.encoding_for_model(MODEL)
+        except OSError:
+            _tokenizer_retry_at = time.time() + ENCODING_RETRY_INTERVAL
+    return _tokenizer or _ByteEncoding()
+
+
+def _spread_order(count):
+    """
+    Yield the indices 0..count-1 starting with the first and last, then the
+    midpoints of ever smaller intervals, so any prefix is spread over the whole range.
+    """
+    yield 0
+    if count > 1:
+        yield count - 1
+    intervals = collections.deque([(0, count - 1)])
+    while intervals:
+        low, high = intervals.popleft()
+        if high - low < 2:
+            continue
+        middle = (low + high) // 2
+        yield middle
+        intervals.extend(((low, middle), (middle, high)))
+
+
+def fit_token_budget(article_text, budget=ARTICLE_TOKEN_BUDGET):
+    """
+    Shorten the article text so it fits in the model's input token budget.
+    
+    Args:
+        article_text (str): Paragraph texts of the article joined by newlines
+        budget (int): Maximum number of tokens to keep
+        
+    Returns:
+        str: The article text, unchanged if it already fits the budget
+        
+    Note:
+        Articles more than twice the budget are first condensed extractively:
+        paragraphs are taken first and last, then evenly spread in between,
+        until the budget is full; the first one that does not fit is cut to the
+        remaining room. Kept paragraphs stay in article order. Whatever is still
+        over budget is then truncated.
+    """
+    encoding = _encoding()
+    tokens = encoding.encode(article_text)
+    if len(tokens) <= budget:
+        return article_text
+
+    paragraphs = article_text.split("\n")
+    if len(tokens) > 2 * budget and len(paragraphs) > 2:
+        kept = {}
+        # Every paragraph but one is joined by a newline token
+        remaining = budget + 1
+        for i in _spread_order(len(paragraphs)):
+            paragraph_tokens = encoding.encode(paragraphs[i])
+            if len(paragraph_tokens) + 1 > remaining:
+                if remaining > 1:
+                    kept[i] = encoding.decode(paragraph_tokens[:remaining - 1])
+                break
+            kept[i] = paragraphs[i]
+            remaining -= len(paragraph_tokens) + 1
+        article_text = "\n".join(kept[i] for i in sorted(kept))
+        tokens = encoding.encode(article_text)
+
+    return encoding.decode(tokens[:budget])
+
+
+def build_analysis_messages(prompts, article_text):
+    """
+    Build the chat messages asking for every analysis section in one completion.
+    
+    Args:
+        prompts (dict): Mapping of section key to its analysis prompt
+        article_text (str): The full text of the article to be analyzed
+        
+    Returns:
+        list: Chat messages for the OpenAI chat completion API
+        
+    Note:
+        The article is sent (and tokenized) once for all sections
+        Enforces a 100-word limit per section for concise, relevant responses
+    """
+    instructions = "\n".join(
+        f"[{i}] {key}: {prompt}" for i, (key, prompt) in enumerate(prompts.items(), start=1)
+    )
+    return [
+        {"role": "system", "content": "You are a critical thinking assistant."},
+        {"role": "user", "content": (
+            f"For the article below, produce {len(prompts)} sections. "
+            f"Return STRICT JSON with keys: {', '.join(prompts)}. "
+            "Each value must be a single string. Limit each section to 100 words. "
+            f"Section instructions follow:\n\n{instructions}\n\nArticle:\n{article_text}"
+        )}
+    ]
+
+
+def build_analysis_request(messages):
+    """Return the chat completion parameters shared by the interactive and batch paths."""
+    return {
+        "model": MODEL,
+        "response_format": {"type": "json_object"},
+        "messages": messages,
+        "max_tokens": 1800,
+    }
+
+
+def _section_text(value):
+    """Normalize one section of the model's JSON reply to plain text."""
+    # Tolerate the model answering a section with a list of points
+    if isinstance(value, list):
+        value = "\n".join(f"* {item}" for item in value)
+    return str(value).strip()
+
+
+def parse_analysis(content, prompts):
+    """
+    Parse the model's JSON reply into one text block per section.
+    
+    Args:
+        content (str): JSON object returned by the model
+        prompts (dict): Mapping of section key to its analysis prompt
+        
+    Returns:
+        dict: Mapping of section key to AI-generated analysis text
+    """
+    analysis = json.loads(content)
+    return {key: _section_text(analysis.get(key, '')) for key in prompts}
+
+
+class SectionStreamParser:
+    """
+    Incrementally extract completed top-level ``"key": value`` pairs from a JSON
+    object that is still being streamed.
+    
+    Feed it text as it arrives; each completed pair is yielded exactly once.
+    Values that are not yet fully received are held back until a later feed.
+    Scalars are only yielded once the following ',' or '}' has arrived, since
+    a number such as 12 may still turn out to be 123.
+    """
+
+    _KEY = re.compile(r'\s*[{,]\s*"((?:[^"\\]|\\.)*)"\s*:\s*')
+    _VALUE_END = re.compile(r'\s*[,}]')
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, text):
+        self.buffer += text
+        while True:
+            match = self._KEY.match(self.buffer, self.pos)
+            if not match:
+                return
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, match.end())
+            except json.JSONDecodeError:
+                # Value is still incomplete
+                return
+            if not isinstance(value, (str, list, dict)) and not self._VALUE_END.match(self.buffer, end):
+                # Scalar may still be growing
+                return
+            self.pos = end
+            yield json.loads(f'"{match.group(1)}"'), value
+
+
+# Transient OpenAI failures worth retrying: rate limits (429), server errors (5xx) and network issues
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APITimeoutError, APIConnectionError)
+# Longest Retry-After delay honored, in seconds
+MAX_RETRY_AFTER = 60
+_backoff = wait_random_exponential(min=1, max=30)
+
+
+def _wait_before_retry(retry_state):
+    """Wait as long as the server's Retry-After header asks, else back off exponentially with jitter."""
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    if response is not None:
+        try:
+            return min(float(response.headers['retry-after']), MAX_RETRY_AFTER)
+        except (KeyError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=_wait_before_retry,
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    reraise=True,
+)
+async def create_chat_completion(client, **params):
+    """
+    Create an OpenAI chat completion, retrying transient failures.
+    
+    Args:
+        client (AsyncOpenAI): OpenAI client, created with max_retries=0 so tenacity owns retries
+        **params: Chat completion parameters
+        
+    Returns:
+        The chat completion, or the completion stream when params include stream=True
+        
+    Note:
+        With stream=True only opening the stream is retried; a failure midway
+        through the reply is raised to the caller, which may already have used
+        the sections received so far
+    """
+    return await client.chat.completions.create(**params)
+
+
+async def stream_openai_analysis(prompts, article_text, on_section):
+    """
+    Generate every analysis section with a single streamed OpenAI chat completion.
+    
+    Args:
+        prompts (dict): Mapping of section key to its analysis prompt
+        article_text (str): The full text of the article to be analyzed
+        on_section (callable): Called as on_section(key, text) as soon as each
+                               section has been fully received
+        
+    Returns:
+        dict: Mapping of section key to AI-generated analysis text
+        
+    Note:
+        The model is forced into JSON mode so the reply parses directly
+        Successful analyses are cached by a hash of the full request
+    """
+    messages = build_analysis_messages(prompts, article_text)
+    analysis_key = cache_key('analysis', MODEL, json.dumps(messages))
+    cached = cache_get(analysis_key)
+    if cached is not None:
+        for key, text in cached.items():
+            on_section(key, text)
+        return cached
+
+    parser = SectionStreamParser()
+    emitted = set()
+    content = []
+    async with AsyncOpenAI(api_key=get_api_key(), max_retries=0) as client:
+        stream = await create_chat_completion(client, **build_analysis_request(messages), stream=True)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            content.append(delta)
+            for key, value in parser.feed(delta):
+                if key in prompts and key not in emitted:
+                    emitted.add(key)
+                    on_section(key, _section_text(value))
+
+    results = parse_analysis("".join(content), prompts)
+    # Sections the model left out are only known once the reply is complete
+    for key, text in results.items():
+        if key not in emitted:
+            on_section(key, text)
+    cache_set(analysis_key, results)
+    return results
+
+
+# Report section titles, in the order they appear in the PDF
+SECTION_TITLES = {
+    'core_claims': "Core Claims",
+    'language_tone': "Language & Tone Analysis",
+    'red_flags': "Potential Red Flags",
+    'verification_questions': "Verification Questions",
+    'entity_recognition': "Entity Recognition",
+    'counter_argument': "Counter-Argument Simulation",
+}
+
+# PDF report styles, built once per process since they never change
+_STYLES = getSampleStyleSheet()
+BULLET_STYLE = ParagraphStyle('Bullet', parent=_STYLES['Normal'], leftIndent=20, spaceAfter=6)
+NORMAL_STYLE = ParagraphStyle('Normal', parent=_STYLES['Normal'], leftIndent=0, spaceAfter=6)
+TITLE_STYLE = ParagraphStyle('Title', parent=_STYLES['Heading2'], textColor=colors.black, spaceAfter=12, fontSize=16, fontName='Helvetica-Bold')
+MAIN_TITLE_STYLE = ParagraphStyle('MainTitle', fontSize=18, textColor=colors.darkblue, spaceAfter=18, fontName='Helvetica-Bold')
+SECTION_COLORS = {
+    "Core Claims": colors.lightblue,
+    "Language & Tone Analysis": colors.lightgreen,
+    "Potential Red Flags": colors.pink,
+    "Verification Questions": colors.lightyellow,
+    "Entity Recognition": colors.lavender,
+    "Counter-Argument Simulation": colors.beige,
+}
+# Line prefixes rendered as list items
+NUMBERED_PREFIXES = tuple(f"{i}." for i in range(1, 10))
+
+# Bounded worker pool for CPU-bound PDF layout, so rendering never runs on the
+# request thread or event loop and concurrent reports cannot pile up unchecked
+PDF_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='pdf')
+
+
+def report_title_flowables(url):
+    """Return the flowables for the report's main title."""
+    return [Paragraph(f"<b>Critical Analysis Report for:</b> {escape(url)}", MAIN_TITLE_STYLE)]
+
+
+def is_list_item(line):
+    """Return True for bullet ('*') and numbered ('1.') report lines."""
+    return line.startswith("*") or line.strip().startswith(NUMBERED_PREFIXES)
+
+
+def section_flowables(title, text):
+    """
+    Convert one analysis section into ReportLab flowables.
+    
+    Args:
+        title (str): Section title, shown on a color-coded background
+        text (str): Plain section content; empty lines are skipped
+        
+    Returns:
+        list: Flowables for the section
+        
+    Note:
+        The text is escaped, so model output such as '<i>' is shown as written
+        rather than parsed as ReportLab markup
+        Bullet ('*') and numbered ('1.') lines are indented as list items
+        Consecutive lines of the same kind share one Paragraph, joined by
+        <br/>, to keep the number of flowables ReportLab parses and lays out low
+    """
+    color = SECTION_COLORS.get(title, colors.white)
+    # Section title with background color
+    flowables = [
+        Spacer(1, 12),
+        Paragraph(f'<para backColor="{color}"><b>{title}</b></para>', TITLE_STYLE),
+        Spacer(1, 8),
+    ]
+    lines = (escape(line) for line in text.splitlines() if line.strip())
+    for is_bullet, run in itertools.groupby(lines, key=is_list_item):
+        style = BULLET_STYLE if is_bullet else NORMAL_STYLE
+        flowables.append(Paragraph("<br/>".join(run), style))
+    flowables.append(Spacer(1, 12))
+    return flowables
+
+
+def build_pdf(story):
+    """Lay out the story on letter-sized pages and return the PDF bytes."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                           leftMargin=50, rightMargin=50, topMargin=60, bottomMargin=40)
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def render_report_pdf(url, results):
+    """
+    Render the analysis results as a color-coded PDF report.
+    
+    Args:
+        url (str): URL of the analyzed article, shown in the report title
+        results (dict): Mapping of section key to analysis text
+        
+    Returns:
+        bytes: The rendered PDF document
+    """
+    story = report_title_flowables(url)
+    for key, title in SECTION_TITLES.items():
+        story.extend(section_flowables(title, results.get(key, '')))
+    return build_pdf(story)
+
+
+# Sections that can be produced by local models instead of the LLM, when installed:
+# spaCy NER for entities and a small sentiment classifier for tone
+SPACY_MODEL = "en_core_web_sm"
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+# Characters of a paragraph quoted as an example in the tone section
+EXCERPT_LENGTH = 160
+
+
+# spaCy entity labels listed in the report, with their display names
+ENTITY_LABELS = {
+    'PERSON': 'Person',
+    'ORG': 'Organization',
+    'GPE': 'Country, city or state',
+    'LOC': 'Location',
+    'NORP': 'Nationality, religious or political group',
+}
+# Maximum number of entities listed, most mentioned first
+MAX_ENTITIES = 15
+
+
+@functools.lru_cache(maxsize=1)
+def _spacy_model():
+    """Load the spaCy NER pipeline, or return None if spaCy or the model cannot be loaded."""
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL)
+    except ImportError:
+        return None
+    except Exception:
+        logger.warning("Could not load spaCy model %s", SPACY_MODEL, exc_info=True)
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _sentiment_classifier():
+    """Load the sentiment classifier, or return None if transformers or the model cannot be loaded."""
+    try:
+        from transformers import pipeline
+        return pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+    except ImportError:
+        return None
+    except Exception:
+        # e.g. transformers installed without a backend such as torch
+        logger.warning("Could not load sentiment model %s", SENTIMENT_MODEL, exc_info=True)
+        return None
+
+
+def local_entity_recognition(article_text):
+    """
+    List the people, organizations and places in the article with spaCy NER.
+    
+    Args:
+        article_text (str): The full text of the article to be analyzed
+        
+    Returns:
+        str: One bullet line per distinct entity with its type, at most MAX_ENTITIES
+    """
+    doc = _spacy_model()(article_text)
+    counts = collections.Counter(
+        (ent.text, ent.label_) for ent in doc.ents if ent.label_ in ENTITY_LABELS
+    )
+    if not counts:
+        return "No named entities found."
+    return "\n".join(
+        f"* {text} ({ENTITY_LABELS[label]})" for (text, label), _ in counts.most_common(MAX_ENTITIES)
+    )
+
+
+def local_language_tone(article_text):
+    """
+    Summarize the article's tone from per-paragraph sentiment.
+    
+    Args:
+        article_text (str): The full text of the article to be analyzed
+        
+    Returns:
+        str: Overall sentiment with the most positive and most negative paragraphs as examples
+    """
+    paragraphs = [p for p in article_text.split("\n") if p.strip()]
+    if not paragraphs:
+        return "No text to analyze."
+    predictions = _sentiment_classifier()(paragraphs, truncation=True)
+
+    counts = collections.Counter(prediction['label'].lower() for prediction in predictions)
+    overall, count = counts.most_common(1)[0]
+    lines = [f"Overall tone: {overall} ({count} of {len(paragraphs)} paragraphs)."]
+
+    # Signed score: close to 1 is strongly positive, close to -1 strongly negative
+    scored = [
+        (prediction['score'] if prediction['label'] == 'POSITIVE' else -prediction['score'], paragraph)
+        for prediction, paragraph in zip(predictions, paragraphs)
+    ]
+    for name, (score, paragraph) in (("Most positive", max(scored)), ("Most negative", min(scored))):
+        excerpt = paragraph if len(paragraph) <= EXCERPT_LENGTH else paragraph[:EXCERPT_LENGTH] + "..."
+        lines.append(f'* {name} ({score:+.2f}): "{excerpt}"')
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=1)
+def local_analyzers():
+    """
+    Return the section analyzers that can run locally, keyed by section.
+    
+    Models are loaded on the first call; sections whose model is not installed
+    are left to the LLM.
+    """
+    analyzers = {}
+    if _spacy_model() is not None:
+        analyzers['entity_recognition'] = local_entity_recognition
+    if _sentiment_classifier() is not None:
+        analyzers['language_tone'] = local_language_tone
+    return analyzers
+
+
+# Background load of the local models, see ready_local_analyzers()
+_models_lock = threading.Lock()
+_models_thread = None
+_loaded_analyzers = None
+
+
+def _load_local_analyzers():
+    """Load the local models into _loaded_analyzers, logging any failure."""
+    global _loaded_analyzers
+    try:
+        _loaded_analyzers = local_analyzers()
+    except Exception:
+        logger.exception("Could not load the local analyzers; all sections go to the LLM")
+        _loaded_analyzers = {}
+
+
+def ready_local_analyzers():
+    """
+    Return the local analyzers whose models have finished loading.
+    
+    The first call starts loading the models (the sentiment classifier is a
+    download of about 250MB) in a background thread and returns no analyzers,
+    so requests never wait for it; until it is done every section goes to the
+    LLM. The thread is a daemon, so a download in progress does not hold up
+    autoreload or Ctrl-C.
+    """
+    global _models_thread
+    with _models_lock:
+        if _models_thread is None:
+            _models_thread = threading.Thread(target=_load_local_analyzers, name='models', daemon=True)
+            _models_thread.start()
+    return _loaded_analyzers or {}
+
+
+async def generate_report(url, prompts, article_text, analyzers):
+    """
+    Analyze the article and render the PDF report, overlapping the two.
+    
+    Each section is converted to flowables as soon as it has streamed in, while
+    later sections are still being generated. Sections with a local analyzer
+    run in worker threads alongside the LLM call instead of being sent to it.
+    Only the final page layout waits for the whole analysis, and it runs on
+    PDF_POOL, off the event loop.
+    
+    Args:
+        url (str): URL of the analyzed article, shown in the report title
+        prompts (dict): Mapping of section key to its analysis prompt
+        article_text (str): The full text of the article to be analyzed
+        analyzers (dict): Local analyzers by section key, see ready_local_analyzers()
+        
+    Returns:
+        tuple: (PDF bytes, whether the analysis failed and the report holds error placeholders)
+    """
+    flowables = {}
+
+    def add_section(key, text):
+        flowables[key] = section_flowables(SECTION_TITLES[key], text)
+
+    async def run_local(key, analyze):
+        add_section(key, await asyncio.to_thread(analyze, article_text))
+
+    llm_prompts = {key: prompt for key, prompt in prompts.items() if key not in analyzers}
+
+    outcomes = await asyncio.gather(
+        stream_openai_analysis(llm_prompts, article_text, add_section),
+        *(run_local(key, analyze) for key, analyze in analyzers.items()),
+        return_exceptions=True,
+    )
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    analysis_failed = bool(errors)
+    if errors:
+        for key in prompts:
+            if key not in flowables:
+                add_section(key, f"Error: {errors[0]}")
+
+    story = report_title_flowables(url)
+    for key, title in SECTION_TITLES.items():
+        story.extend(flowables.get(key) or section_flowables(title, ''))
+    pdf_bytes = await asyncio.get_running_loop().run_in_executor(PDF_POOL, build_pdf, story)
+    return pdf_bytes, analysis_failed
+
+
+# Rendered reports are stored under MEDIA_ROOT, named by their report cache key,
+# so repeat requests can be redirected to a static file served by nginx/whitenoise
+REPORTS_DIR = os.path.join(settings.MEDIA_ROOT, 'reports')
+# Minimum number of seconds between two sweeps of expired reports
+REPORT_PRUNE_INTERVAL = 3600
+_last_prune = 0.0
+
+
+class HttpResponseSeeOther(HttpResponseRedirect):
+    """Redirect a POST to a resource that is then fetched with GET."""
+    status_code = 303
+
+
+def report_digest(report_key):
+    """Return the file name digest of the report stored under report_key."""
+    return report_key.split(':', 1)[1][:32]
+
+
+def report_path(digest):
+    """Return the file system path of the stored report with the given digest."""
+    return os.path.join(REPORTS_DIR, f"{digest}.pdf")
+
+
+def report_url(digest):
+    """Return the public URL of the stored report with the given digest."""
+    return f"{settings.MEDIA_URL}reports/{digest}.pdf"
+
+
+def stored_report(digest):
+    """Return whether a report with the given digest is stored and younger than CACHE_TIMEOUT."""
+    try:
+        return time.time() - os.path.getmtime(report_path(digest)) < CACHE_TIMEOUT
+    except OSError:
+        return False
+
+
+def store_report(digest, pdf_bytes):
+    """
+    Write a rendered report to REPORTS_DIR and sweep out expired ones.
+    
+    Args:
+        digest (str): Report digest, see report_digest()
+        pdf_bytes (bytes): The rendered PDF document
+        
+    Note:
+        ReportLab output embeds a creation timestamp, so reports are named by
+        their cache key rather than their content; a re-rendered report
+        replaces the previous file instead of adding a new one.
+    """
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    path = report_path(digest)
+    # Write to a temporary file first so a half-written report is never served
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, path)
+    prune_reports()
+
+
+def prune_reports():
+    """Delete stored reports older than CACHE_TIMEOUT, at most once per REPORT_PRUNE_INTERVAL."""
+    global _last_prune
+    now = time.time()
+    if now - _last_prune < REPORT_PRUNE_INTERVAL:
+        return
+    _last_prune = now
+    with os.scandir(REPORTS_DIR) as entries:
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime >= CACHE_TIMEOUT:
+                    os.remove(entry.path)
+            except OSError:
+                # Already removed by another worker
+                pass
+
+
+# Size of the chunks a PDF response is written to the client in
+PDF_CHUNK_SIZE = 64 * 1024
+
+
+def pdf_response(pdf_bytes):
+    """
+    Stream a PDF report to the client as a file download.
+    
+    Args:
+        pdf_bytes (bytes): The rendered PDF document
+        
+    Returns:
+        StreamingHttpResponse: Attachment response sending the PDF in PDF_CHUNK_SIZE chunks
+    """
+    buffer = io.BytesIO(pdf_bytes)
+
+    def iter_chunks():
+        while True:
+            chunk = buffer.read(PDF_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    response = StreamingHttpResponse(iter_chunks(), content_type='application/pdf')
+    response['Content-Length'] = str(len(pdf_bytes))
+    response['Content-Disposition'] = 'attachment; filename="analysis.pdf"'
+    return response
+
+
+def submit_batch_analysis(url, article_text, prompts):
+    """
+    Queue the analysis of an article on the OpenAI Batch API.
+    
+    Args:
+        url (str): URL of the analyzed article, kept in the batch metadata for the report title
+        article_text (str): The full text of the article to be analyzed
+        prompts (dict): Mapping of section key to its analysis prompt
+        
+    Returns:
+        Batch: The created OpenAI batch job
+        
+    Note:
+        Batch jobs complete within 24 hours at half the price of interactive calls
+    """
+    client = OpenAI(api_key=get_api_key())
+    line = {
+        "custom_id": "analysis",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": build_analysis_request(build_analysis_messages(prompts, article_text)),
+    }
+    batch_file = io.BytesIO((json.dumps(line) + "\n").encode('utf-8'))
+    batch_file.name = "analysis.jsonl"
+    input_file = client.files.create(file=batch_file, purpose="batch")
+    return client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata={"url": url},
+    )
+
+
+async def process_url(request):
     """
     Process a news article URL and generate a comprehensive critical analysis report in PDF format.
     
@@ -26,240 +1102,178 @@ def process_url(request):
     3. Analyzes the content using multiple AI-powered critical thinking prompts
     4. Generates a professionally formatted PDF report with color-coded sections
     
+    With ``?mode=batch`` the analysis is queued on the OpenAI Batch API instead,
+    and the report is fetched later from the ``result/<job_id>/`` endpoint.
+    
     Args:
         request (HttpRequest): Django request object containing the URL in POST data
         
     Returns:
         HttpResponse: PDF file containing the analysis report if successful
+                     303 redirect to the stored report when the same article was analyzed before
+                     202 JSON response with the batch job id in batch mode
+                     400/502 JSON response if the batch cannot be queued
                      404 error if article content cannot be found
+                     502 error if the article cannot be fetched
     """
     # Get URL from request or use default
     url = request.POST.get('url') or "https://www.hindustantimes.com/trending/us/indian-student-at-penn-state-gives-university-apartment-tour-candid-video-goes-viral-101756006453089.html?articleno=1&utm_source=taboola_widget&utm_medium=taboola_widget&utm_campaign=article_detail_page"
 
-    # Extract unique dataid from URL path
-    parsed_url = urlparse(url)
-    data_id = parsed_url.path
+    # Fetch, analysis and rendering all run on the server's event loop
+    return await analyze_url(url, batch_mode=request.GET.get('mode') == 'batch')
 
-    # Fetch HTML content from the article URL
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Find the main article div using dataid
-    main_div = soup.find("div", {"dataid": data_id})
-
-    if main_div:
-        # Extract all paragraph texts inside the main div
-        paragraphs = main_div.find_all("p")
-        article_text = "\n".join(p.get_text(strip=True) for p in paragraphs)
-
-        # Load prompt templates from the prompts folder
-        import os
-        prompt_dir = os.path.join(os.path.dirname(__file__), '../prompts')
-        prompt_files = [
-            'core_claims.txt',
-            'language_tone.txt',
-            'red_flags.txt',
-            'verification_questions.txt',
-            'entity_recognition.txt',
-            'counter_argument.txt',
-        ]
-        prompts = {}
-
-        # Use OpenAI new client for analysis
-        from openai import OpenAI
-        
-        # Initialize OpenAI client with API key from environment variables
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
-        client = OpenAI(api_key=api_key)
-
-        # Read each prompt file
-        for fname in prompt_files:
-            with open(os.path.join(prompt_dir, fname), encoding='utf-8') as f:
-                prompts[fname] = f.read().strip()
-
-        def get_openai_response(prompt, article_text):
-            """
-            Generate an AI-powered analysis response using OpenAI's chat completion API.
-            
-            Args:
-                prompt (str): The specific analysis prompt to be used (e.g., core claims, red flags)
-                article_text (str): The full text of the article to be analyzed
-                
-            Returns:
-                str: AI-generated analysis response, limited to 100 words
-                
-            Note:
-                Uses system role as 'critical thinking assistant' for focused analysis
-                Enforces a 100-word limit for concise, relevant responses
-            """
-            messages = [
-                {"role": "system", "content": "You are a critical thinking assistant."},
-                {"role": "user", "content": f"{prompt}\n\nLimit your response to 100 words.\n\nArticle:\n{article_text}"}
-            ]
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",  # Use the latest model as per your example
-                messages=messages,
-                max_tokens=300
-            )
-            return completion.choices[0].message.content.strip()
-
-        # Run all prompts and collect results
-        results = {}
-        for key, prompt in prompts.items():
+
+# csrf_exempt only wraps sync views in Django 4.2, so mark the async view directly
+process_url.csrf_exempt = True
+
+
+async def analyze_url(url, batch_mode=False):
+    """
+    Fetch, analyze and report on a news article; the body of process_url.
+    
+    Args:
+        url (str): URL of the news article
+        batch_mode (bool): Queue the analysis on the Batch API instead of running it now
+        
+    Returns:
+        HttpResponse: See process_url
+    """
+    try:
+        article_text = await fetch_article_text(url)
+    except httpx.HTTPError as e:
+        return HttpResponse(f"Could not fetch article: {e}", status=502)
+
+    if article_text is not None:
+        # Bound the input tokens billed for long-form articles
+        article_text = fit_token_budget(article_text)
+        prompts = PROMPTS
+
+        # Non-interactive analyses go through the cheaper Batch API
+        if batch_mode:
             try:
-                results[key] = get_openai_response(prompt, article_text)
-            except Exception as e:
-                results[key] = f"Error: {e}"
-
-        # Build Markdown report from all responses
-        report = f"# Critical Analysis Report for: {url}\n"
-        report += "\n### Core Claims\n" + results.get('core_claims.txt', '')
-        report += "\n### Language & Tone Analysis\n" + results.get('language_tone.txt', '')
-        report += "\n### Potential Red Flags\n" + results.get('red_flags.txt', '')
-        report += "\n### Verification Questions\n" + results.get('verification_questions.txt', '')
-        report += "\n### Entity Recognition\n" + results.get('entity_recognition.txt', '')
-        report += "\n### Counter-Argument Simulation\n" + results.get('counter_argument.txt', '')
-
-        # --- PDF Generation ---
-        import io
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib import colors
-
-        def markdown_to_sections(report):
-            """
-            Convert a markdown-formatted report into a dictionary of sections.
-            
-            Args:
-                report (str): The full markdown report containing multiple sections
-                
-            Returns:
-                dict: A dictionary where keys are section titles and values are lists of content lines
-                
-            Note:
-                - Sections are identified by '### ' prefix in the markdown
-                - Content lines are grouped under their respective section titles
-                - Empty lines are filtered out
-            """
-            sections = {}
-            current_title = None
-            for line in report.splitlines():
-                if line.startswith('### '):
-                    current_title = line.replace('### ', '').strip()
-                    sections[current_title] = []
-                elif current_title and line.strip():
-                    sections[current_title].append(line)
-            return sections
-
-        sections = markdown_to_sections(report)
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter,
-                               leftMargin=50, rightMargin=50, topMargin=60, bottomMargin=40)
-        styles = getSampleStyleSheet()
-        bullet_style = ParagraphStyle('Bullet', parent=styles['Normal'], leftIndent=20, spaceAfter=6)
-        normal_style = ParagraphStyle('Normal', parent=styles['Normal'], leftIndent=0, spaceAfter=6)
-        title_style = ParagraphStyle('Title', parent=styles['Heading2'], textColor=colors.black, spaceAfter=12, fontSize=16, fontName='Helvetica-Bold')
-
-        section_colors = {
-            "Core Claims": colors.lightblue,
-            "Language & Tone Analysis": colors.lightgreen,
-            "Potential Red Flags": colors.pink,
-            "Verification Questions": colors.lightyellow,
-            "Entity Recognition": colors.lavender,
-            "Counter-Argument Simulation": colors.beige,
-        }
+                batch = await asyncio.to_thread(submit_batch_analysis, url, article_text, prompts)
+            except BadRequestError as e:
+                # e.g. a URL longer than the 512 characters allowed in batch metadata
+                return JsonResponse({"error": e.message}, status=400)
+            except APIError as e:
+                return JsonResponse({"error": e.message}, status=502)
+            return JsonResponse({"job_id": batch.id, "status": batch.status}, status=202)
+
+        # Redirect to the stored report for the same article and prompts, if any
+        # Sections from local models differ from the LLM's, so they are part of the key
+        analyzers = {key: analyze for key, analyze in ready_local_analyzers().items() if key in prompts}
+        report_key = cache_key('report', url, article_text, ','.join(sorted(analyzers)), *prompts.values())
+        digest = report_digest(report_key)
+        if stored_report(digest):
+            response = HttpResponseSeeOther(report_url(digest))
+            response['X-Cache'] = 'HIT'
+            return response
 
-        story = []
-        # Title
-        story.append(Paragraph(f"<b>Critical Analysis Report for:</b> {url}", ParagraphStyle('MainTitle', fontSize=18, textColor=colors.darkblue, spaceAfter=18, fontName='Helvetica-Bold')))
-
-        for title, content in sections.items():
-            color = section_colors.get(title, colors.white)
-            # Section title with background color
-            story.append(Spacer(1, 12))
-            story.append(Paragraph(f'<para backColor="{color}"><b>{title}</b></para>', title_style))
-            story.append(Spacer(1, 8))
-            numbered_prefixes = tuple(str(i)+'.' for i in range(1,10))
-            for line in content:
-                if line.startswith("*") or line.strip().startswith(numbered_prefixes):
-                    story.append(Paragraph(line, bullet_style))
-                else:
-                    story.append(Paragraph(line, normal_style))
-            story.append(Spacer(1, 12))
-
-        doc.build(story)
-        buffer.seek(0)
-        return HttpResponse(buffer, content_type='application/pdf')
+        # Stream every prompt in one request while the report is being prepared
+        pdf_bytes, analysis_failed = await generate_report(url, prompts, article_text, analyzers)
+        # Never store a report that contains error placeholders
+        if not analysis_failed:
+            await asyncio.to_thread(store_report, digest, pdf_bytes)
+        response = pdf_response(pdf_bytes)
+        response['X-Cache'] = 'MISS'
+        return response
     else:
         return HttpResponse("Could not find article div with given dataid", status=404)
-        title_style = ParagraphStyle('Title', parent=styles['Heading2'], textColor=colors.black, spaceAfter=12, fontSize=16, fontName='Helvetica-Bold')
-
-        section_colors = {
-            "Core Claims": colors.lightblue,
-            "Language & Tone Analysis": colors.lightgreen,
-            "Potential Red Flags": colors.pink,
-            "Verification Questions": colors.lightyellow,
-            "Entity Recognition": colors.lavender,
-            "Counter-Argument Simulation": colors.beige,
-        }
 
-        story = []
-        # Title
-        story.append(Paragraph("<b>Critical Analysis Report Of News Article</b>", ParagraphStyle('MainTitle', fontSize=18, textColor=colors.darkblue, spaceAfter=18, fontName='Helvetica-Bold')))
-
-        for title, content in sections.items():
-            color = section_colors.get(title, colors.white)
-            # Section title with background color
-            story.append(Spacer(1, 12))
-            story.append(Paragraph(f'<para backColor="{color}"><b>{title}</b></para>', title_style))
-            story.append(Spacer(1, 8))
-            numbered_prefixes = tuple(str(i)+'.' for i in range(1,10))
-            for line in content:
-                if line.startswith("*") or line.strip().startswith(numbered_prefixes):
-                    story.append(Paragraph(line, bullet_style))
-                else:
-                    story.append(Paragraph(line, normal_style))
-            story.append(Spacer(1, 12))
-
-        doc.build(story)
-        buffer.seek(0)
-        return HttpResponse(buffer, content_type='application/pdf')
-        # p.drawString(40, y, f"Critical Analysis Report for: {url}")
-        y -= 40
-
-        for title, content in sections.items():
-            color = section_colors.get(title, colors.white)
-            p.setFillColor(color)
-            p.rect(30, y-20, width-60, 25, fill=1, stroke=0)
-            p.setFillColor(colors.black)
-            p.setFont("Helvetica-Bold", 14)
-            p.drawString(40, y, title)
-            y -= 30
-            p.setFont("Helvetica", 12)
-            for line in content:
-                numbered_prefixes = tuple(str(i)+"." for i in range(1,10))
-                if line.startswith("*") or line.strip().startswith(numbered_prefixes):
-                    p.setFillColor(colors.darkblue)
-                else:
-                    p.setFillColor(colors.black)
-                p.drawString(50, y, line)
-                y -= 18
-                if y < 50:
-                    p.showPage()
-                    y = height - 50
-            y -= 10
-
-        p.save()
-        buffer.seek(0)
-        return HttpResponse(buffer, content_type='application/pdf')
-    # else:
-    #     return HttpResponse("Could not find article div with given dataid", status=404)
+
+def read_batch_line(client, file_id):
+    """
+    Read the result line of a single-request batch.
     
+    Args:
+        client (OpenAI): OpenAI client
+        file_id (str): Output or error file of the batch
+        
+    Returns:
+        dict: The parsed JSONL line, with the request's ``response`` and ``error``
+    """
+    # The batch holds a single request, so each of its files is a single JSONL line
+    return json.loads(client.files.content(file_id).text.splitlines()[0])
+
+
+def batch_result(request, job_id):
+    """
+    Return the PDF report of a batch analysis queued with ``?mode=batch``.
+    
+    Args:
+        request (HttpRequest): Django request object
+        job_id (str): OpenAI batch job id returned when the analysis was queued
+        
+    Returns:
+        HttpResponse: 303 redirect to the stored report once the batch has completed
+                     202 JSON response with the batch status while it is still running
+                     404 JSON response if there is no batch with this id
+                     502 JSON response if the batch or its request failed, expired or was
+                     cancelled, or its output cannot be read
+                     
+    Note:
+        The report is rendered and stored on the first poll after completion;
+        later polls are redirected to the stored file without calling OpenAI.
+    """
+    digest = report_digest(cache_key('report', 'batch', job_id))
+    if stored_report(digest):
+        return HttpResponseSeeOther(report_url(digest))
+
+    client = OpenAI(api_key=get_api_key())
+    try:
+        batch = client.batches.retrieve(job_id)
+    except NotFoundError:
+        return JsonResponse({"job_id": job_id, "error": "No batch with this id"}, status=404)
+    except APIError as e:
+        return JsonResponse({"job_id": job_id, "error": e.message}, status=502)
+
+    status = {"job_id": batch.id, "status": batch.status}
+    if batch.status in ('failed', 'expired', 'cancelling', 'cancelled'):
+        return JsonResponse(status, status=502)
+    if batch.status != 'completed':
+        return JsonResponse(status, status=202)
 
+    try:
+        # A completed batch whose request failed only has an error file
+        if not batch.output_file_id:
+            if not batch.error_file_id:
+                return JsonResponse({**status, "error": "Batch completed without output"}, status=502)
+            line = read_batch_line(client, batch.error_file_id)
+            error = line.get("error") or (line.get("response") or {}).get("body")
+            return JsonResponse({**status, "error": error}, status=502)
 
+        line = read_batch_line(client, batch.output_file_id)
+        if line["response"]["status_code"] != 200:
+            return JsonResponse({**status, "error": line["response"]["body"]}, status=502)
+        content = line["response"]["body"]["choices"][0]["message"]["content"]
+        results = parse_analysis(content, PROMPTS)
+    except APIError as e:
+        return JsonResponse({**status, "error": e.message}, status=502)
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError) as e:
+        # e.g. a reply cut off at max_tokens, which is not valid JSON
+        return JsonResponse({**status, "error": f"Could not read batch output: {e}"}, status=502)
+
+    pdf_bytes = PDF_POOL.submit(render_report_pdf, (batch.metadata or {}).get("url", ""), results).result()
+    store_report(digest, pdf_bytes)
+    return HttpResponseSeeOther(report_url(digest))
+
+
+def cache_status(request):
+    """
+    Report this worker's cache counters, for monitoring the hit rate.
+    
+    Args:
+        request (HttpRequest): Django request object
+        
+    Returns:
+        JsonResponse: Memory and disk hits, misses and the number of entries in each tier
+    """
+    with _memory_lock:
+        stats = {
+            "memory_hits": cache_stats['memory_hits'],
+            "disk_hits": cache_stats['disk_hits'],
+            "misses": cache_stats['misses'],
+            "memory_entries": len(_memory_cache),
+        }
+    stats["disk_entries"] = len(cache)
+    return JsonResponse(stats)
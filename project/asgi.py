@@ -13,4 +13,26 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from digital_skeptic_ai.views import close_http_client  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """
+    Serve Django and handle the ASGI lifespan protocol, which Django does not.
+    
+    The article fetch client lives as long as the server's event loop and is
+    closed on shutdown.
+    """
+    if scope['type'] != 'lifespan':
+        return await django_application(scope, receive, send)
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_http_client()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
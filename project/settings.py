@@ -119,6 +119,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Generated PDF reports (in production, serve MEDIA_URL straight from nginx)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'pdfs'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
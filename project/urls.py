@@ -14,6 +14,8 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path,include
 
@@ -21,3 +23,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('digital_skeptic_ai.urls')),
 ]
+
+# Serve generated reports in development; static() is a no-op when DEBUG is off
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)